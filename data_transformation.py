@@ -1,103 +1,110 @@
 import pandas as pd
-import itertools
-
-# Function to split call duration by hours
-def split_call_by_hour(start_time, end_time, time_zone):
-    time_range = pd.date_range(start=start_time, end=end_time, freq='h')
-    split_minutes = []
-    
-    for i in range(len(time_range) - 1):
-        start_interval = time_range[i]
-        end_interval = time_range[i + 1]
-        
-        # Calculate the time spent in this hour interval
-        start_in_this_hour = max(start_time, start_interval)
-        end_in_this_hour = min(end_time, end_interval)
-        
-        # Calculate minutes spent in this interval
-        minutes_in_this_hour = (end_in_this_hour - start_in_this_hour).total_seconds() / 60
-        
-        if minutes_in_this_hour > 0:
-            split_minutes.append({
-                'time_bucket': start_in_this_hour,
-                'minutes': minutes_in_this_hour,
-                'time_zone': time_zone
-            })
-    
-    return split_minutes
-
-# Function to re-shape the dataset
-
-def transform_for_time_heatmap(df_combined):
-
-    # List to store the split minutes for both SG and NZ
-    sg_minutes = []
-    nz_minutes = []
-
-    # Iterate over each call to split into hourly buckets
-    for _, row in df_combined.iterrows():
-        # Split SG call duration by hour
-        sg_minutes.extend(split_call_by_hour(row['Start_Datetime_SG'], row['End_Datetime_SG'], 'SG'))
-        
-        # Split NZ call duration by hour
-        nz_minutes.extend(split_call_by_hour(row['Start_Datetime_NZ'], row['End_Datetime_NZ'], 'NZ'))
-
-    # Convert to DataFrame
-    sg_minutes_df = pd.DataFrame(sg_minutes)
-    nz_minutes_df = pd.DataFrame(nz_minutes)
+import numpy as np
 
-    # Adjust the weekday to start from Sunday (0=Sunday, 6=Saturday)
-    sg_minutes_df['Weekday'] = (sg_minutes_df['time_bucket'].dt.dayofweek + 1) % 7
-    nz_minutes_df['Weekday'] = (nz_minutes_df['time_bucket'].dt.dayofweek + 1) % 7
+# Time zones tracked by the dashboard; a bucket's position in this list is its time zone code
+TIME_ZONES = ['SG', 'NZ']
+
+# Nanoseconds per hour and per minute, for working on raw int64 timestamps
+HOUR_NS = 3_600_000_000_000
+MINUTE_NS = 60_000_000_000
+
+# Every combination of day of the week (Sunday=0, Saturday=6) and hour of the day (0 to 23)
+FULL_GRID_INDEX = pd.MultiIndex.from_product([range(7), range(24)], names=['Day_of_Week', 'Hour'])
+
+# Split kernel on raw int64 UTC nanoseconds: one output element per (call, clock hour) pair
+def split_hours(starts_ns, ends_ns):
+    # Floor in UTC: SG and NZ offsets are whole hours, so UTC hours line up with local hours
+    first_hour = starts_ns // HOUR_NS
+    n_buckets = ends_ns // HOUR_NS - first_hour + 1
+
+    # Prefix sum of bucket counts gives each call its own contiguous slice of the output
+    offsets = np.cumsum(n_buckets) - n_buckets
+    row_idx = np.repeat(np.arange(len(starts_ns)), n_buckets)
+    hour_offset = np.arange(len(row_idx)) - offsets[row_idx]
+
+    # Clock-hour boundaries for every (call, hour) pair
+    bucket_ns = (first_hour[row_idx] + hour_offset) * HOUR_NS
+    starts = np.maximum(bucket_ns, starts_ns[row_idx])
+    ends = np.minimum(bucket_ns + HOUR_NS, ends_ns[row_idx])
+
+    # Calculate minutes spent in each hour interval
+    minutes = (ends - starts) / MINUTE_NS
+    mask = minutes > 0
+
+    return bucket_ns[mask], minutes[mask], row_idx[mask]
 
-    # Add hour of the day
-    sg_minutes_df['Hour'] = sg_minutes_df['time_bucket'].dt.hour
-    nz_minutes_df['Hour'] = nz_minutes_df['time_bucket'].dt.hour
+# Function to split call durations by hours, for a whole column of calls at once
+def split_call_by_hour(start_times, end_times, time_zone):
+    # .values gives UTC datetime64[ns], viewed here as int64 nanoseconds
+    bucket_ns, minutes, row_idx = split_hours(start_times.values.view('i8'), end_times.values.view('i8'))
 
-    # Aggregate by day of week and hour for SG
-    sg_agg = sg_minutes_df.groupby(['Weekday', 'Hour']).agg({'minutes': 'sum'}).reset_index()
-    # Rename the aggregated column
-    sg_agg = sg_agg.rename(columns={'minutes': 'minutes_SG'})
+    # Local wall-clock hour for each bucket
+    time_bucket = pd.to_datetime(bucket_ns, utc=True).tz_convert(start_times.dt.tz).tz_localize(None)
 
-    # Aggregate by day of week and hour for NZ
-    nz_agg = nz_minutes_df.groupby(['Weekday', 'Hour']).agg({'minutes': 'sum'}).reset_index()
-    # Rename the aggregated column
-    nz_agg = nz_agg.rename(columns={'minutes': 'minutes_NZ'})
+    # Time zone stored as a small integer code rather than a string per bucket
+    tz_codes = np.full(len(minutes), TIME_ZONES.index(time_zone), dtype=np.uint8)
 
-    # Define days of the week (Sunday=0, Saturday=6)
-    days_of_week = [0, 1, 2, 3, 4, 5, 6]
+    return time_bucket.to_numpy(), minutes, tz_codes, row_idx
 
-    # Define hours of the day (0 to 23)
-    hours_of_day = list(range(24))
+# Function to build the hourly minutes table: one row per local date and hour of the day
 
-    # Generate all combinations of days of the week and hours of the day
-    week_combinations = list(itertools.product(days_of_week, hours_of_day))
+def build_hourly_minutes(df_combined):
 
-    # Create a DataFrame from the combinations
-    df_week_combinations = pd.DataFrame(week_combinations, columns=['Day_of_Week', 'Hour'])
+    # Collapse calls with identical start/end instants into one row, weighted by how often it occurs
+    span_columns = [f'{edge}_Datetime_{tz}' for tz in TIME_ZONES for edge in ('Start', 'End')]
+    unique_calls = df_combined[span_columns].value_counts(sort=False).rename('weight').reset_index()
+    weights = unique_calls['weight'].to_numpy()
 
-    # # Optionally, if you want to show the day of the week as a string (e.g., Sunday, Monday, etc.)
-    # df_week_combinations['Day_of_Week'] = df_week_combinations['Day_of_Week'].map({
-    #     0: 'Sunday', 1: 'Monday', 2: 'Tuesday', 3: 'Wednesday', 
-    #     4: 'Thursday', 5: 'Friday', 6: 'Saturday'
-    # })
+    # Split every distinct call into hourly buckets for both SG and NZ
+    bucket_chunks, minute_chunks, tz_chunks = [], [], []
+    for tz in TIME_ZONES:
+        time_bucket, minutes, tz_codes, row_idx = split_call_by_hour(
+            unique_calls[f'Start_Datetime_{tz}'], unique_calls[f'End_Datetime_{tz}'], tz
+        )
+        bucket_chunks.append(time_bucket)
+        minute_chunks.append(minutes * weights[row_idx])
+        tz_chunks.append(tz_codes)
 
-    # Merge datasets
-    df_week_combinations = pd.merge(left=df_week_combinations, 
-                                    right=sg_agg,
-                                    left_on=['Day_of_Week', 'Hour'],
-                                    right_on=['Weekday', 'Hour'],
-                                    how='left')
+    # Stack both time zones into one long table, built once from the concatenated arrays
+    all_minutes_df = pd.DataFrame({
+        'time_bucket': np.concatenate(bucket_chunks),
+        'minutes': np.concatenate(minute_chunks),
+        'time_zone': pd.Categorical.from_codes(np.concatenate(tz_chunks), TIME_ZONES),
+    })
 
-    df_week_combinations = df_week_combinations.drop(columns=['Weekday']) # drop unnecessary column
+    # Aggregate by local wall-clock hour, one column per time zone (like calendar_minutes)
+    df_hourly = (
+        all_minutes_df.groupby(['time_bucket', 'time_zone'], observed=True)['minutes'].sum()
+        .unstack('time_zone')
+        .reindex(columns=TIME_ZONES)
+        .rename(columns=lambda tz: f'minutes_{tz}')
+        .rename_axis(columns=None)
+        .reset_index()
+    )
 
-    df_week_combinations = pd.merge(left=df_week_combinations, 
-                                    right=nz_agg,
-                                    left_on=['Day_of_Week', 'Hour'],
-                                    right_on=['Weekday', 'Hour'],
-                                    how='left')
+    # Split the hour bucket into its date and hour of the day
+    df_hourly.insert(0, 'date', df_hourly['time_bucket'].dt.normalize())
+    df_hourly.insert(1, 'hour', df_hourly['time_bucket'].dt.hour)
 
-    df_week_combinations = df_week_combinations.drop(columns=['Weekday']) # drop unnecessary column
+    return df_hourly.drop(columns=['time_bucket'])
+
+# Function to re-shape the (date-filtered) hourly minutes for the time heatmap
+
+def transform_for_time_heatmap(df_hourly):
+
+    # Adjust the weekday to start from Sunday (0=Sunday, 6=Saturday)
+    weekday = ((df_hourly['date'].dt.dayofweek + 1) % 7).rename('Weekday')
+
+    # Aggregate by day of week and hour for SG and NZ; the reindex below sets the final order
+    agg = df_hourly.groupby([weekday, 'hour'], observed=True, sort=False)[['minutes_SG', 'minutes_NZ']].sum(min_count=1)
+
+    # Line both aggregates up against the full week grid
+    df_week_combinations = agg.reindex(FULL_GRID_INDEX).reset_index()
 
     return df_week_combinations
 
+
+# Offline ETL: rebuild data/hourly_minutes.parquet from the call logs
+if __name__ == '__main__':
+    df_calls = pd.read_parquet('data/full_call_logs.parquet')
+    build_hourly_minutes(df_calls).to_parquet('data/hourly_minutes.parquet', index=False)
@@ -40,14 +40,71 @@ st.set_page_config(
 )
 
 
+# Only the call log columns the dashboard reads; the parquet carries ~40 more
+CALL_LOG_COLUMNS = [
+    "Call_Length_Minutes",
+    "Start_Datetime_SG", "End_Datetime_SG", "Start_Month_Year_SG", "End_Month_Year_SG",
+    "Start_Datetime_NZ", "End_Datetime_NZ", "Start_Month_Year_NZ", "End_Month_Year_NZ",
+]
+
+
 @st.cache_data
 def load_data():
-    df = pd.read_parquet("data/full_call_logs.parquet")
+    df = pd.read_parquet("data/full_call_logs.parquet", columns=CALL_LOG_COLUMNS)
     df_calendar = pd.read_parquet("data/calendar_minutes.parquet")
-    return df, df_calendar
+    # float32 is plenty for minute totals and halves the bytes every mask/groupby touches
+    df["Call_Length_Minutes"] = df["Call_Length_Minutes"].astype(np.float32)
+    df_calendar[["Total_Mins_SG", "Total_Mins_NZ"]] = df_calendar[["Total_Mins_SG", "Total_Mins_NZ"]].astype(np.float32)
+    # Sunday-first weekday (Sun=0, Sat=6) and the Sunday that starts each date's week
+    df_calendar["Weekday"] = (df_calendar['date'].dt.dayofweek.to_numpy(dtype=np.int8) + 1) % 7
+    df_calendar["Week_Start_Date"] = df_calendar['date'] - pd.to_timedelta(df_calendar["Weekday"], unit='d')
+    # Minutes per local date and hour, pre-split offline by `python data_transformation.py`
+    df_hourly = pd.read_parquet("data/hourly_minutes.parquet")
+    # Start timestamp of every selectable month, parsed once rather than on each rerun
+    month_year_map = {p: p.to_timestamp() for p in df['Start_Month_Year_SG'].unique()}
+    return df, df_calendar, df_hourly, month_year_map
+
+
+# `_df` / `_df_calendar` / `_df_hourly` come straight from load_data and never change, so Streamlit
+# skips hashing them and keys these caches on the filter values alone.
+# Month_Year columns are period[M], so the range masks compare integer ordinals.
+@st.cache_data
+def filter_calls(_df, start_month_year, end_month_year, tz_suffix):
+    return _df[
+        (_df[f'Start_Month_Year_{tz_suffix}'] >= start_month_year) &
+        (_df[f'End_Month_Year_{tz_suffix}'] <= end_month_year)
+    ]
+
+
+@st.cache_data
+def filter_calendar(_df_calendar, start_dt_filter, end_dt_filter):
+    return _df_calendar[
+        (_df_calendar['date'] >= start_dt_filter) &
+        (_df_calendar['date'] < end_dt_filter)
+    ]
+
+
+@st.cache_data
+def cached_time_heatmap(_df_hourly, start_dt_filter, end_dt_filter):
+    return transform_for_time_heatmap(_df_hourly[
+        (_df_hourly['date'] >= start_dt_filter) &
+        (_df_hourly['date'] < end_dt_filter)
+    ])
+
+
+@st.cache_data
+def cached_calendar_heatmap(_df_calendar, start_dt_filter, end_dt_filter, mins_col):
+    calendar_data = filter_calendar(_df_calendar, start_dt_filter, end_dt_filter)
 
+    # groupby + unstack (sorted keys) rather than pivot_table, which re-infers its aggregator per call
+    return (
+        calendar_data.groupby(["Weekday", "Week_Start_Date"])[mins_col].sum()
+        .unstack(fill_value=0)
+        .reindex(range(7), fill_value=0)
+    )
 
-df, df_calendar = load_data()
+
+df, df_calendar, df_hourly, month_year_map = load_data()
 
 # === Modern design system CSS ===
 st.markdown(f"""
@@ -452,10 +509,7 @@ with st.container(key="filter_card"):
         )
         tz_suffix = "SG" if timezone == "Singapore (SG)" else "NZ"
 
-filtered_df = df[
-    (df[f'Start_Month_Year_{tz_suffix}'] >= start_month_year) &
-    (df[f'End_Month_Year_{tz_suffix}'] <= end_month_year)
-]
+filtered_df = filter_calls(df, start_month_year, end_month_year, tz_suffix)
 
 
 # === Overview metrics ===
@@ -480,311 +534,163 @@ metrics_html = (
 st.html(metrics_html)
 
 
-# === SECTION: Calendar heatmap ===
-# Custom Plotly heatmap that fits the full date range into one viewport-width row.
-# Uses month-based x-axis labels with subtle month divider lines for readability.
-section_header("📅", "Our Call Calendar", f"Each square is a day · showing {tz_suffix} time")
+# Date window shared by the calendar, time of day and trend sections
+start_dt_filter = month_year_map[start_month_year]
+end_dt_filter = month_year_map[end_month_year] + pd.DateOffset(months=1)
 
-mins_col = f"Total_Mins_{tz_suffix}"
 
-start_dt_filter = pd.to_datetime(start_month_year, format='%Y-%m')
-end_dt_filter = pd.to_datetime(end_month_year, format='%Y-%m') + pd.DateOffset(months=1)
+# Each chart section below is an st.fragment: its own widgets (trend selectors, bin size)
+# rerun only that section, while the date range / timezone filters rerun the whole page.
 
-calendar_data = df_calendar[
-    (df_calendar['date'] >= start_dt_filter) &
-    (df_calendar['date'] < end_dt_filter)
-].copy()
-
-# Sunday-first weekday (Sun=0, Sat=6)
-calendar_data["Weekday"] = (calendar_data['date'].dt.dayofweek + 1) % 7
-calendar_data["Week_Start_Date"] = calendar_data['date'] - pd.to_timedelta(calendar_data["Weekday"], unit='d')
-
-heatmap_data = calendar_data.pivot_table(
-    index="Weekday",
-    columns="Week_Start_Date",
-    values=mins_col,
-    aggfunc="sum",
-    fill_value=0,
-).reindex(range(7), fill_value=0)
+# === SECTION: Calendar heatmap ===
+# Custom Plotly heatmap that fits the full date range into one viewport-width row.
+# Uses month-based x-axis labels with subtle month divider lines for readability.
+@st.fragment
+def _calendar_section(start_dt_filter, end_dt_filter, tz_suffix):
+    section_header("📅", "Our Call Calendar", f"Each square is a day · showing {tz_suffix} time")
 
-week_start_dates = pd.Series(sorted(heatmap_data.columns))
-heatmap_data = heatmap_data[week_start_dates]
+    mins_col = f"Total_Mins_{tz_suffix}"
 
-# Per-cell actual date for the hover tooltip
-date_text = [
-    [(wsd + pd.Timedelta(days=d)).strftime('%a, %d %b %Y') for wsd in week_start_dates]
-    for d in range(7)
-]
+    heatmap_data = cached_calendar_heatmap(df_calendar, start_dt_filter, end_dt_filter, mins_col)
+    week_start_dates = pd.Series(heatmap_data.columns)
+
+    # Per-cell actual date for the hover tooltip, formatted a whole weekday row at a time
+    week_start_index = pd.DatetimeIndex(week_start_dates)
+    date_text = [
+        (week_start_index + pd.Timedelta(days=d)).strftime('%a, %d %b %Y').tolist()
+        for d in range(7)
+    ]
+
+    # Month tick positions: first week of each new month (based on midweek date)
+    month_tick_x, month_tick_label = [], []
+    prev_month = None
+    for i, wsd in enumerate(week_start_dates):
+        midweek = wsd + pd.Timedelta(days=3)
+        if midweek.month != prev_month:
+            month_tick_x.append(i)
+            month_tick_label.append(midweek.strftime('%b %Y'))
+            prev_month = midweek.month
+
+    # Subtle vertical lines between months
+    month_divider_shapes = [
+        dict(
+            type='line',
+            xref='x', yref='y',
+            x0=month_tick_x[i] - 0.5, x1=month_tick_x[i] - 0.5,
+            y0=-0.5, y1=6.5,
+            line=dict(color=COLORS['border'], width=2),
+        )
+        for i in range(1, len(month_tick_x))
+    ]
+
+    # One contiguous float32 block, so Plotly doesn't have to re-layout or re-cast the matrix
+    cal_z = np.ascontiguousarray(heatmap_data.to_numpy(dtype=np.float32))
+
+    fig_cal = go.Figure(data=go.Heatmap(
+        z=cal_z,
+        x=list(range(len(week_start_dates))),
+        y=['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'],
+        customdata=date_text,
+        colorscale=HEATMAP_COLORSCALE,
+        hoverongaps=False,
+        hovertemplate=(
+            "<b>%{customdata}</b><br>"
+            "<span style='color:#8B8593'>Minutes:</span> %{z:,.0f}<extra></extra>"
+        ),
+        showscale=False,
+        xgap=3,
+        ygap=3,
+        zmin=0,
+    ))
 
-# Month tick positions: first week of each new month (based on midweek date)
-month_tick_x, month_tick_label = [], []
-prev_month = None
-for i, wsd in enumerate(week_start_dates):
-    midweek = wsd + pd.Timedelta(days=3)
-    if midweek.month != prev_month:
-        month_tick_x.append(i)
-        month_tick_label.append(midweek.strftime('%b %Y'))
-        prev_month = midweek.month
-
-# Subtle vertical lines between months
-month_divider_shapes = [
-    dict(
-        type='line',
-        xref='x', yref='y',
-        x0=month_tick_x[i] - 0.5, x1=month_tick_x[i] - 0.5,
-        y0=-0.5, y1=6.5,
-        line=dict(color=COLORS['border'], width=2),
+    fig_cal.update_layout(
+        xaxis=dict(
+            tickmode='array',
+            tickvals=month_tick_x,
+            ticktext=month_tick_label,
+            tickfont=dict(size=11, color=COLORS['text']),
+            showgrid=False, zeroline=False, showline=False,
+            side='bottom',
+        ),
+        yaxis=dict(
+            tickfont=dict(size=11, color=COLORS['text_muted']),
+            autorange='reversed',
+            showgrid=False, zeroline=False, showline=False,
+        ),
+        shapes=month_divider_shapes,
+        hoverlabel=dict(
+            font_family='Inter, sans-serif',
+            font_size=13,
+            font_color=COLORS['text'],
+            bgcolor=COLORS['card'],
+            bordercolor=COLORS['primary'],
+        ),
+        height=280,
+        margin=dict(l=40, r=20, t=20, b=45),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter, sans-serif', color=COLORS['text'], size=12),
     )
-    for i in range(1, len(month_tick_x))
-]
 
-fig_cal = go.Figure(data=go.Heatmap(
-    z=heatmap_data.values,
-    x=list(range(len(week_start_dates))),
-    y=['Sun', 'Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat'],
-    customdata=date_text,
-    colorscale=HEATMAP_COLORSCALE,
-    hoverongaps=False,
-    hovertemplate=(
-        "<b>%{customdata}</b><br>"
-        "<span style='color:#8B8593'>Minutes:</span> %{z:,.0f}<extra></extra>"
-    ),
-    showscale=False,
-    xgap=3,
-    ygap=3,
-    zmin=0,
-))
-
-fig_cal.update_layout(
-    xaxis=dict(
-        tickmode='array',
-        tickvals=month_tick_x,
-        ticktext=month_tick_label,
-        tickfont=dict(size=11, color=COLORS['text']),
-        showgrid=False, zeroline=False, showline=False,
-        side='bottom',
-    ),
-    yaxis=dict(
-        tickfont=dict(size=11, color=COLORS['text_muted']),
-        autorange='reversed',
-        showgrid=False, zeroline=False, showline=False,
-    ),
-    shapes=month_divider_shapes,
-    hoverlabel=dict(
-        font_family='Inter, sans-serif',
-        font_size=13,
-        font_color=COLORS['text'],
-        bgcolor=COLORS['card'],
-        bordercolor=COLORS['primary'],
-    ),
-    height=280,
-    margin=dict(l=40, r=20, t=20, b=45),
-    paper_bgcolor='rgba(0,0,0,0)',
-    plot_bgcolor='rgba(0,0,0,0)',
-    font=dict(family='Inter, sans-serif', color=COLORS['text'], size=12),
-)
+    with st.container(key="cal_card"):
+        st.plotly_chart(fig_cal, use_container_width=True, config=PLOTLY_CONFIG)
+
 
-with st.container(key="cal_card"):
-    st.plotly_chart(fig_cal, use_container_width=True, config=PLOTLY_CONFIG)
+_calendar_section(start_dt_filter, end_dt_filter, tz_suffix)
 
 
 # === SECTION: Time of day heatmap ===
-section_header("⏰", "Favourite Time To Talk", f"Showing {tz_suffix} time")
+@st.fragment
+def _time_section(start_dt_filter, end_dt_filter, tz_suffix):
+    section_header("⏰", "Favourite Time To Talk", f"Showing {tz_suffix} time")
 
-df_day_hour = transform_for_time_heatmap(filtered_df)
+    df_day_hour = cached_time_heatmap(df_hourly, start_dt_filter, end_dt_filter)
 
-all_days = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
-df_day_hour["Day_Name"] = df_day_hour["Day_of_Week"].map(lambda x: all_days[x])
+    all_days = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
 
-heatmap_data = df_day_hour.pivot_table(
-    index="Day_Name",
-    columns="Hour",
-    values=f"minutes_{tz_suffix}",
-    aggfunc="sum",
-    fill_value=0,
-)
-heatmap_data = heatmap_data.reindex(all_days)
-
-# Tick at every 3 hours for readability
-hour_tickvals = [0, 3, 6, 9, 12, 15, 18, 21]
-hour_ticktext = ['12 AM', '3 AM', '6 AM', '9 AM', '12 PM', '3 PM', '6 PM', '9 PM']
-
-fig_time = go.Figure(data=go.Heatmap(
-    z=heatmap_data.values,
-    x=list(range(24)),
-    y=heatmap_data.index,
-    colorscale=HEATMAP_COLORSCALE,
-    showscale=False,
-    hoverongaps=False,
-    hovertemplate=(
-        "<b>%{y}</b> at <b>%{x}:00</b><br>"
-        "<span style='color:#8B8593'>Duration:</span> %{z:,.0f} min<extra></extra>"
-    ),
-    xgap=3,
-    ygap=3,
-))
-
-fig_time.update_layout(
-    xaxis=dict(
-        tickmode='array',
-        tickvals=hour_tickvals,
-        ticktext=hour_ticktext,
-        tickfont=dict(size=11, color=COLORS["text_muted"]),
-        showgrid=False,
-    ),
-    yaxis=dict(
-        tickfont=dict(size=11, color=COLORS["text_muted"]),
-        categoryorder='array',
-        categoryarray=all_days,
-        autorange="reversed",
-        showgrid=False,
-    ),
-    hoverlabel=dict(
-        font_family="Inter, sans-serif",
-        font_size=13,
-        font_color=COLORS["text"],
-        bgcolor=COLORS["card"],
-        bordercolor=COLORS["primary"],
-    ),
-    height=380,
-    margin=dict(l=40, r=20, t=20, b=40),
-    paper_bgcolor='rgba(0,0,0,0)',
-    plot_bgcolor='rgba(0,0,0,0)',
-    font=dict(family='Inter, sans-serif', color=COLORS["text"], size=12),
-)
+    heatmap_data = (
+        df_day_hour.groupby(["Day_of_Week", "Hour"])[f"minutes_{tz_suffix}"].sum()
+        .unstack(fill_value=0)
+        .reindex(range(7), fill_value=0)
+        .set_axis(all_days)
+    )
 
-with st.container(key="time_heatmap_card"):
-    st.plotly_chart(fig_time, use_container_width=True, config=PLOTLY_CONFIG)
+    # Tick at every 3 hours for readability
+    hour_tickvals = [0, 3, 6, 9, 12, 15, 18, 21]
+    hour_ticktext = ['12 AM', '3 AM', '6 AM', '9 AM', '12 PM', '3 PM', '6 PM', '9 PM']
 
+    time_z = np.ascontiguousarray(heatmap_data.to_numpy(dtype=np.float32))
 
-# === SECTION: Call duration trend ===
-section_header("📈", "How Our Calls Have Grown", "Track total or average call time over your chosen interval")
-
-with st.container(key="trend_card"):
-    ctrl1, ctrl2, _ = st.columns([1, 1, 2])
-    with ctrl1:
-        time_interval = st.selectbox("Interval", ["Days", "Weeks", "Months"], index=1, key="trend_interval")
-    with ctrl2:
-        metric = st.selectbox("Metric", ["Total Minutes", "Average Minutes"], key="trend_metric")
-
-    df_call_trend = df_calendar[
-        (df_calendar['date'] >= start_dt_filter) &
-        (df_calendar['date'] < end_dt_filter)
-    ].copy()
-    df_call_trend['date'] = pd.to_datetime(df_call_trend['date'])
-    mins_col = f"Total_Mins_{tz_suffix}"
-    trend_data = df_call_trend[['date', mins_col]].dropna()
-
-    if time_interval == "Days":
-        trend_data["Interval"] = trend_data["date"]
-    elif time_interval == "Weeks":
-        trend_data["Interval"] = trend_data["date"] - pd.to_timedelta(trend_data["date"].dt.dayofweek + 1, unit='d')
-    else:
-        trend_data["Interval"] = trend_data["date"].dt.to_period('M').dt.start_time
-
-    if metric == "Average Minutes":
-        trend_data = trend_data.groupby("Interval")[mins_col].mean().reset_index()
-        y_axis_label = "Avg Minutes"
-    else:
-        trend_data = trend_data.groupby("Interval")[mins_col].sum().reset_index()
-        y_axis_label = "Total Minutes"
-
-    trend_data = trend_data.sort_values("Interval")
-
-    if time_interval == "Months":
-        trend_data["Interval_Label"] = trend_data["Interval"].dt.strftime("%b %Y")
-    else:
-        trend_data["Interval_Label"] = trend_data["Interval"].dt.strftime("%d %b %Y")
-
-    fig_duration = go.Figure()
-    fig_duration.add_trace(go.Scatter(
-        x=trend_data["Interval_Label"],
-        y=trend_data[mins_col],
-        mode='lines+markers',
-        line=dict(color=COLORS["primary"], width=2.5, shape='spline', smoothing=0.8),
-        marker=dict(color=COLORS["primary"], size=7, line=dict(color=COLORS["card"], width=2)),
-        fill='tozeroy',
-        fillcolor='rgba(232, 97, 125, 0.08)',
+    fig_time = go.Figure(data=go.Heatmap(
+        z=time_z,
+        x=list(range(24)),
+        y=heatmap_data.index,
+        colorscale=HEATMAP_COLORSCALE,
+        showscale=False,
+        hoverongaps=False,
         hovertemplate=(
-            f"<b>%{{x}}</b><br>"
-            f"<span style='color:#8B8593'>{y_axis_label}:</span> %{{y:,.1f}}<extra></extra>"
+            "<b>%{y}</b> at <b>%{x}:00</b><br>"
+            "<span style='color:#8B8593'>Duration:</span> %{z:,.0f} min<extra></extra>"
         ),
+        xgap=3,
+        ygap=3,
     ))
 
-    fig_duration.update_layout(
-        height=420,
-        margin=dict(l=20, r=20, t=20, b=50),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Inter, sans-serif', color=COLORS["text"], size=12),
-        hoverlabel=dict(
-            font_family="Inter, sans-serif",
-            font_size=13,
-            font_color=COLORS["text"],
-            bgcolor=COLORS["card"],
-            bordercolor=COLORS["primary"],
-        ),
-        hovermode='x unified',
+    fig_time.update_layout(
         xaxis=dict(
+            tickmode='array',
+            tickvals=hour_tickvals,
+            ticktext=hour_ticktext,
+            tickfont=dict(size=11, color=COLORS["text_muted"]),
             showgrid=False,
-            showline=False,
-            zeroline=False,
-            tickfont=dict(size=10, color=COLORS["text_muted"]),
-            showspikes=True,
-            spikemode='across',
-            spikethickness=1,
-            spikecolor=COLORS["primary_soft"],
-            spikedash='solid',
         ),
         yaxis=dict(
-            title=dict(text=y_axis_label, font=dict(size=11, color=COLORS["text_muted"])),
-            showgrid=True,
-            gridcolor=COLORS["border"],
-            zeroline=False,
-            showline=False,
-            tickfont=dict(size=10, color=COLORS["text_muted"]),
-        ),
-    )
-
-    st.plotly_chart(fig_duration, use_container_width=True, config=PLOTLY_CONFIG)
-
-
-# === SECTION: Distribution histogram ===
-section_header("📊", "Call Duration Distribution", "How long do our calls usually last?")
-
-with st.container(key="histogram_card"):
-    bcol, _ = st.columns([1, 3])
-    with bcol:
-        bin_size = st.slider('Bin Size', min_value=5, max_value=50, value=30, step=5, key="bin_size_slider")
-
-    # Build histogram with explicit bin edges anchored at 0 so no bin spans negative values
-    call_durations = filtered_df["Call_Length_Minutes"].dropna()
-    if len(call_durations):
-        max_val = float(call_durations.max())
-        bin_width = max(1.0, max_val / max(bin_size, 1))
-    else:
-        max_val, bin_width = 60.0, 5.0
-    x_max = max_val + bin_width  # extend by one bin width so the max value isn't clipped
-
-    fig_distribution = go.Figure(data=go.Histogram(
-        x=call_durations,
-        xbins=dict(start=0, end=x_max, size=bin_width),
-        marker=dict(
-            color=COLORS["primary"],
-            line=dict(color=COLORS["primary_dark"], width=1),
-        ),
-        opacity=0.85,
-        hovertemplate=(
-            "<b>%{x} min</b><br>"
-            "<span style='color:#8B8593'>Calls:</span> %{y}<extra></extra>"
+            tickfont=dict(size=11, color=COLORS["text_muted"]),
+            categoryorder='array',
+            categoryarray=all_days,
+            autorange="reversed",
+            showgrid=False,
         ),
-    ))
-    fig_distribution.update_layout(
-        height=420,
-        margin=dict(l=20, r=20, t=20, b=50),
-        paper_bgcolor='rgba(0,0,0,0)',
-        plot_bgcolor='rgba(0,0,0,0)',
-        font=dict(family='Inter, sans-serif', color=COLORS["text"], size=12),
         hoverlabel=dict(
             font_family="Inter, sans-serif",
             font_size=13,
@@ -792,27 +698,183 @@ with st.container(key="histogram_card"):
             bgcolor=COLORS["card"],
             bordercolor=COLORS["primary"],
         ),
-        bargap=0.08,
-        xaxis=dict(
-            title=dict(text="Call Duration (minutes)", font=dict(size=11, color=COLORS["text_muted"])),
-            showgrid=False,
-            zeroline=False,
-            showline=False,
-            rangemode='nonnegative',
-            range=[0, x_max],
-            tickfont=dict(size=10, color=COLORS["text_muted"]),
-        ),
-        yaxis=dict(
-            title=dict(text="Number of Calls", font=dict(size=11, color=COLORS["text_muted"])),
-            showgrid=True,
-            gridcolor=COLORS["border"],
-            zeroline=False,
-            showline=False,
-            tickfont=dict(size=10, color=COLORS["text_muted"]),
-        ),
+        height=380,
+        margin=dict(l=40, r=20, t=20, b=40),
+        paper_bgcolor='rgba(0,0,0,0)',
+        plot_bgcolor='rgba(0,0,0,0)',
+        font=dict(family='Inter, sans-serif', color=COLORS["text"], size=12),
     )
 
-    st.plotly_chart(fig_distribution, use_container_width=True, config=PLOTLY_CONFIG)
+    with st.container(key="time_heatmap_card"):
+        st.plotly_chart(fig_time, use_container_width=True, config=PLOTLY_CONFIG)
+
+
+_time_section(start_dt_filter, end_dt_filter, tz_suffix)
+
+
+# === SECTION: Call duration trend ===
+@st.fragment
+def _trend_section(start_dt_filter, end_dt_filter, tz_suffix):
+    section_header("📈", "How Our Calls Have Grown", "Track total or average call time over your chosen interval")
+
+    with st.container(key="trend_card"):
+        ctrl1, ctrl2, _ = st.columns([1, 1, 2])
+        with ctrl1:
+            time_interval = st.selectbox("Interval", ["Days", "Weeks", "Months"], index=1, key="trend_interval")
+        with ctrl2:
+            metric = st.selectbox("Metric", ["Total Minutes", "Average Minutes"], key="trend_metric")
+
+        df_call_trend = filter_calendar(df_calendar, start_dt_filter, end_dt_filter)
+        df_call_trend['date'] = pd.to_datetime(df_call_trend['date'])
+        mins_col = f"Total_Mins_{tz_suffix}"
+        trend_data = df_call_trend[['date', mins_col]].dropna()
+
+        if time_interval == "Days":
+            trend_data["Interval"] = trend_data["date"]
+        elif time_interval == "Weeks":
+            trend_data["Interval"] = trend_data["date"] - pd.to_timedelta(trend_data["date"].dt.dayofweek + 1, unit='d')
+        else:
+            trend_data["Interval"] = trend_data["date"].dt.to_period('M').dt.start_time
+
+        if metric == "Average Minutes":
+            trend_data = trend_data.groupby("Interval")[mins_col].mean().reset_index()
+            y_axis_label = "Avg Minutes"
+        else:
+            trend_data = trend_data.groupby("Interval")[mins_col].sum().reset_index()
+            y_axis_label = "Total Minutes"
+
+        trend_data = trend_data.sort_values("Interval")
+
+        if time_interval == "Months":
+            trend_data["Interval_Label"] = trend_data["Interval"].dt.strftime("%b %Y")
+        else:
+            trend_data["Interval_Label"] = trend_data["Interval"].dt.strftime("%d %b %Y")
+
+        fig_duration = go.Figure()
+        fig_duration.add_trace(go.Scatter(
+            x=trend_data["Interval_Label"],
+            y=trend_data[mins_col],
+            mode='lines+markers',
+            line=dict(color=COLORS["primary"], width=2.5, shape='spline', smoothing=0.8),
+            marker=dict(color=COLORS["primary"], size=7, line=dict(color=COLORS["card"], width=2)),
+            fill='tozeroy',
+            fillcolor='rgba(232, 97, 125, 0.08)',
+            hovertemplate=(
+                f"<b>%{{x}}</b><br>"
+                f"<span style='color:#8B8593'>{y_axis_label}:</span> %{{y:,.1f}}<extra></extra>"
+            ),
+        ))
+
+        fig_duration.update_layout(
+            height=420,
+            margin=dict(l=20, r=20, t=20, b=50),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(family='Inter, sans-serif', color=COLORS["text"], size=12),
+            hoverlabel=dict(
+                font_family="Inter, sans-serif",
+                font_size=13,
+                font_color=COLORS["text"],
+                bgcolor=COLORS["card"],
+                bordercolor=COLORS["primary"],
+            ),
+            hovermode='x unified',
+            xaxis=dict(
+                showgrid=False,
+                showline=False,
+                zeroline=False,
+                tickfont=dict(size=10, color=COLORS["text_muted"]),
+                showspikes=True,
+                spikemode='across',
+                spikethickness=1,
+                spikecolor=COLORS["primary_soft"],
+                spikedash='solid',
+            ),
+            yaxis=dict(
+                title=dict(text=y_axis_label, font=dict(size=11, color=COLORS["text_muted"])),
+                showgrid=True,
+                gridcolor=COLORS["border"],
+                zeroline=False,
+                showline=False,
+                tickfont=dict(size=10, color=COLORS["text_muted"]),
+            ),
+        )
+
+        st.plotly_chart(fig_duration, use_container_width=True, config=PLOTLY_CONFIG)
+
+
+_trend_section(start_dt_filter, end_dt_filter, tz_suffix)
+
+
+# === SECTION: Distribution histogram ===
+@st.fragment
+def _distribution_section(filtered_df):
+    section_header("📊", "Call Duration Distribution", "How long do our calls usually last?")
+
+    with st.container(key="histogram_card"):
+        bcol, _ = st.columns([1, 3])
+        with bcol:
+            bin_size = st.slider('Bin Size', min_value=5, max_value=50, value=30, step=5, key="bin_size_slider")
+
+        # Build histogram with explicit bin edges anchored at 0 so no bin spans negative values
+        call_durations = filtered_df["Call_Length_Minutes"].dropna()
+        if len(call_durations):
+            max_val = float(call_durations.max())
+            bin_width = max(1.0, max_val / max(bin_size, 1))
+        else:
+            max_val, bin_width = 60.0, 5.0
+        x_max = max_val + bin_width  # extend by one bin width so the max value isn't clipped
+
+        fig_distribution = go.Figure(data=go.Histogram(
+            x=call_durations,
+            xbins=dict(start=0, end=x_max, size=bin_width),
+            marker=dict(
+                color=COLORS["primary"],
+                line=dict(color=COLORS["primary_dark"], width=1),
+            ),
+            opacity=0.85,
+            hovertemplate=(
+                "<b>%{x} min</b><br>"
+                "<span style='color:#8B8593'>Calls:</span> %{y}<extra></extra>"
+            ),
+        ))
+        fig_distribution.update_layout(
+            height=420,
+            margin=dict(l=20, r=20, t=20, b=50),
+            paper_bgcolor='rgba(0,0,0,0)',
+            plot_bgcolor='rgba(0,0,0,0)',
+            font=dict(family='Inter, sans-serif', color=COLORS["text"], size=12),
+            hoverlabel=dict(
+                font_family="Inter, sans-serif",
+                font_size=13,
+                font_color=COLORS["text"],
+                bgcolor=COLORS["card"],
+                bordercolor=COLORS["primary"],
+            ),
+            bargap=0.08,
+            xaxis=dict(
+                title=dict(text="Call Duration (minutes)", font=dict(size=11, color=COLORS["text_muted"])),
+                showgrid=False,
+                zeroline=False,
+                showline=False,
+                rangemode='nonnegative',
+                range=[0, x_max],
+                tickfont=dict(size=10, color=COLORS["text_muted"]),
+            ),
+            yaxis=dict(
+                title=dict(text="Number of Calls", font=dict(size=11, color=COLORS["text_muted"])),
+                showgrid=True,
+                gridcolor=COLORS["border"],
+                zeroline=False,
+                showline=False,
+                tickfont=dict(size=10, color=COLORS["text_muted"]),
+            ),
+        )
+
+        st.plotly_chart(fig_distribution, use_container_width=True, config=PLOTLY_CONFIG)
+
+
+_distribution_section(filtered_df)
 
 
 # === Footer ===